@@ -1,6 +1,8 @@
 'check sample rate'
+import functools
 import joblib
 import os
+import pickle
 
 # --- Configuration ---
 BASE_DIR = r"C:\Users\schmi\Documents\Studium\TUM\Masterthesis\Experimental Data"
@@ -8,14 +10,34 @@ PARTICIPANT_ID = 1          # <-- Participant to check
 TRIAL_TO_CHECK = 5          # <-- Trial number to check (e.g., 1-24)
 PHASE_TO_CHECK = "phase1"   # Use "phase1" (reach) or "phase2" (lift)
 
+def indices_path_for(pid):
+    """Path to the metadata file created by the preprocessing script."""
+    preprocessed_dir = os.path.join(BASE_DIR, f"P({pid})", "Preprocessed_Data_Matrix")
+    return os.path.join(preprocessed_dir, f"P{pid}_feature_indices.joblib")
+
+@functools.lru_cache(maxsize=32)
+def _load_metadata(pid, mtime):
+    # The metadata is a small dict of lists, so plain pickle.load skips
+    # joblib's numpy-aware unpickler overhead; fall back to joblib for
+    # files that actually need it.
+    path = indices_path_for(pid)
+    try:
+        with open(path, 'rb') as fh:
+            return pickle.load(fh)
+    except pickle.UnpicklingError:
+        return joblib.load(path)
+
+def load_metadata(pid):
+    """Memoized per (pid, file mtime): repeated checks in one session skip
+    the disk read and unpickling entirely."""
+    return _load_metadata(pid, os.path.getmtime(indices_path_for(pid)))
+
 # --- Verification Logic ---
 try:
-    # Path to the metadata file created by your preprocessing script
-    preprocessed_dir = os.path.join(BASE_DIR, f"P({PARTICIPANT_ID})", "Preprocessed_Data_Matrix")
-    indices_path = os.path.join(preprocessed_dir, f"P{PARTICIPANT_ID}_feature_indices.joblib")
+    indices_path = indices_path_for(PARTICIPANT_ID)
 
-    # Load the metadata dictionary
-    metadata = joblib.load(indices_path)
+    # Load the metadata dictionary (cached across repeated checks)
+    metadata = load_metadata(PARTICIPANT_ID)
     
     # Get the list of trial lengths for the chosen phase
     trial_lengths_key = f"{PHASE_TO_CHECK}_trial_lengths"
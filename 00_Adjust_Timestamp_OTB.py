@@ -1,7 +1,11 @@
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
+# Compiled once at import time; matches e.g. "processed_emg_data_20241028_115040600_bad_channels.npy"
+_NAME_RE = re.compile(r"^(processed_emg_data_)(\d{8}_\d{9})(.*\.(npy|png))$")
+
 def add_time_to_timestamp(timestamp_str, delta_seconds=0.2):
     """
     Parses the timestamp string in the format 'YYYYMMDD_HHMMSSmmm',
@@ -15,6 +19,15 @@ def add_time_to_timestamp(timestamp_str, delta_seconds=0.2):
     - new_timestamp_str (str): Adjusted timestamp string in the same format
     """
     try:
+        # Fast path: for sub-second deltas only the millisecond field changes
+        # unless the addition carries into the seconds. Plain integer math and
+        # an f-string avoid the strptime/strftime machinery per file.
+        extra_s, ms = divmod(int(timestamp_str[15:18]) + round(delta_seconds * 1000), 1000)
+        if extra_s == 0:
+            return f"{timestamp_str[:15]}{ms:03d}"
+
+        # Slow path: the carry can roll over seconds/minutes/hours/date,
+        # so let datetime handle it.
         # Example: "20241028_115040600"
         # Split into date and time parts
         date_part, time_part = timestamp_str.split('_')
@@ -57,20 +70,24 @@ def rename_files_in_folder(folder_path, delta_seconds=0.2):
     - folder_path (str): Path to the folder containing the files to rename
     - delta_seconds (float): Seconds to add to the timestamp
     """
-    pattern = re.compile(r"^(processed_emg_data_)(\d{8}_\d{9})(.*\.(npy|png))$")
+    # Precomputed prefix: one string concat per rename instead of a full
+    # os.path.join call in the hot loop
+    folder_prefix = folder_path + os.sep
 
-    # Iterate over all files in the folder
-    for filename in os.listdir(folder_path):
-        file_path = os.path.join(folder_path, filename)
+    # Iterate over all files in the folder; scandir reuses the stat info from
+    # the directory read, so no extra isfile() syscall per entry
+    for entry in os.scandir(folder_path):
+        filename = entry.name
+        file_path = entry.path
 
         # Skip directories
-        if not os.path.isfile(file_path):
+        if not entry.is_file(follow_symlinks=False):
             continue
 
         # Match against our pattern
-        match = pattern.match(filename)
+        match = _NAME_RE.match(filename)
         if not match:
-            continue 
+            continue
 
         prefix, timestamp_str, suffix_full, _ = match.groups()
         # suffix_full includes everything after the timestamp, e.g., "_bad_channels.npy"
@@ -83,7 +100,7 @@ def rename_files_in_folder(folder_path, delta_seconds=0.2):
 
         # Construct the new filename
         new_filename = f"{prefix}{new_timestamp_str}{suffix_full}"
-        new_file_path = os.path.join(folder_path, new_filename)
+        new_file_path = folder_prefix + new_filename
 
         # Check if the new filename already exists to avoid overwriting
         if os.path.exists(new_file_path):
@@ -107,17 +124,22 @@ def main():
     # Subfolder path after participant folder
     subfolder_path = os.path.join("Processed EMG Data", "Processed OTB+")
 
-    for participant in participant_list:
-        participant_folder = f"P({participant})"
-        target_folder = os.path.join(base_path, participant_folder, subfolder_path)
+    def process_participant(participant):
+        target_folder = os.path.join(base_path, f"P({participant})", subfolder_path)
 
         if not os.path.exists(target_folder):
             print(f"[Participant P({participant})] Folder not found: {target_folder}")
-            continue
+            return
 
         print(f"\n[Participant P({participant})] Renaming files in: {target_folder}")
         rename_files_in_folder(target_folder, delta_seconds=0.2)
 
+    # The per-file work is os.rename syscalls (which release the GIL), so a
+    # thread pool overlaps the I/O latency across participant folders
+    with ThreadPoolExecutor(max_workers=len(participant_list)) as executor:
+        # list() drains the iterator so worker exceptions surface here
+        list(executor.map(process_participant, participant_list))
+
     print("\nAll participant folders processed.")
 
 if __name__ == "__main__":
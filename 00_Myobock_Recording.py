@@ -19,19 +19,25 @@ from datetime import datetime
 import threading
 import tkinter as tk
 from tkinter import messagebox
-import time  
 
 # Set up the serial connection
 try:
-    ser = serial.Serial('COM9', 115200)  # Match baud rate with Arduino and check port number, i.e. COM4 or COM9 etc.
+    # Match baud rate with Arduino and check port number, i.e. COM4 or COM9 etc.
+    # The short timeout lets readline() block in the kernel until a full line
+    # arrives instead of busy-polling, while still waking up regularly so the
+    # thread can notice the recording flag.
+    ser = serial.Serial('COM9', 115200, timeout=0.05)
     ser.flush()
 except serial.SerialException as e:
     print(f"Error: {e}")
     exit()
 
+DEBUG = False  # Per-sample prints serialize on the stdout lock; enable only for debugging
+
 recording = False
 csv_file = None
 csv_writer = None
+flush_done = threading.Event()  # Set by the recording thread once its row buffer is drained
 
 def start_recording():
     global csv_file, csv_writer, recording
@@ -40,9 +46,9 @@ def start_recording():
         start_time = datetime.now().strftime("%Y-%m-%d_%H-%M-%S.%f")[:-3]  # Truncate to milliseconds
         filename = f'C:\\Users\\inreh\\MA_Patrick\\Myobock Sensors\\Myobock Data Recordings\\sensor_data_{start_time}.csv'
 
-        # Open the CSV file
+        # Open the CSV file with a 1 MB buffer so libc batches writes to disk
         try:
-            csv_file = open(filename, mode='w', newline='')
+            csv_file = open(filename, mode='w', newline='', buffering=1 << 20)
             csv_writer = csv.writer(csv_file)
             # Write the CSV header
             csv_writer.writerow(["Sensor1", "Sensor2", "Sensor3", "Sensor4", "Sensor5", "Sensor6", "Sensor7", "Sensor8"])
@@ -56,35 +62,54 @@ def start_recording():
 def stop_recording():
     global csv_file, recording
     if csv_file:
+        # Stop the recording thread first and wait for it to flush any
+        # buffered rows before closing the file underneath it
+        flush_done.clear()
+        recording = False
+        flush_done.wait(timeout=1.0)
         try:
             csv_file.close()
             print("Recording stopped and file closed.")
         except Exception as e:
             messagebox.showerror("Error", f"Error closing file: {e}")
         csv_file = None
-        recording = False
         record_button.config(state=tk.NORMAL)
         stop_button.config(state=tk.DISABLED)
 
 def record_data():
     global recording
+    row_buf = []
     while True:
-        if recording and ser.in_waiting > 0:
-            # Read the raw data from the serial port
-            raw_data = ser.readline()
-
-            # Decode the serial data
-            line = raw_data.decode('utf-8', errors='ignore').strip()
-
-            # Split the data into sensor values and write to CSV
-            sensor_data = line.split(',')
-            if len(sensor_data) == 8:  # Ensure correct number of sensor values
-                csv_writer.writerow(sensor_data)
+        # Blocking read: the OS wakes the thread when a full line arrives
+        # (or after the 50 ms timeout), so no busy-polling of in_waiting
+        raw_data = ser.readline()
+
+        if not recording:
+            # Drain any rows still buffered, then tell stop_recording it is
+            # safe to close the file
+            if row_buf and csv_writer:
+                csv_writer.writerows(row_buf)
+                row_buf.clear()
+            flush_done.set()
+            continue
+
+        if not raw_data:
+            continue
+
+        # Decode the serial data
+        line = raw_data.decode('utf-8', errors='ignore').strip()
+
+        # Split the data into sensor values and buffer for a batched write
+        sensor_data = line.split(',')
+        if len(sensor_data) == 8:  # Ensure correct number of sensor values
+            row_buf.append(sensor_data)
+            if len(row_buf) >= 256:
+                csv_writer.writerows(row_buf)
+                row_buf.clear()
+            if DEBUG:
                 print(f"Data recorded: {sensor_data}")
-            else:
-                print(f"Unexpected data format: {line}")
-        # Small delay to match Arduino's 1ms delay
-        time.sleep(0.001)
+        else:
+            print(f"Unexpected data format: {line}")
 
 # Start the recording thread to continuously read from the serial port
 data_thread = threading.Thread(target=record_data)
@@ -24,56 +24,106 @@ Features:
        each participant's recordings and logs independently.
 '''
 
+import bisect
+import functools
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+import numpy as np
+
+# Matches e.g. b"[2024-11-18T14:15:03.123456] ... Setting active recording".
+# Compiled once and applied to raw bytes so log lines never need decoding.
+_REC_RE = re.compile(rb"^\[([0-9T:\-\.]+)\].*Setting active recording", re.IGNORECASE)
+
+# Matches recording folder names such as "recording_14_47_20",
+# "recording_14_47_20.123" or "recording_14_47_20.123_gmt+1" in one pass
+_FOLDER_RE = re.compile(r"^recording_(\d{1,2})_(\d{1,2})_(\d{1,2})(?:\.\d+)?(?:_gmt[+-]\d+)?",
+                        re.IGNORECASE)
+
+@functools.lru_cache(maxsize=None)
 def gather_log_timestamps(log_folder):
     """
     Reads every .log file in the given log_folder and collects all timestamps
-    from lines containing 'Setting active recording'. 
-    Returns a list of (datetime, line).
+    from lines containing 'Setting active recording'.
+    Returns a tuple of (datetime, line).
+
+    Cached per log_folder: each recording folder queries the same logs, so
+    without the cache the whole log directory would be re-read and re-parsed
+    once per recording.
     """
     all_timestamps = []
-    
-    log_files = [
-        f for f in os.listdir(log_folder)
-        if f.startswith("log_") and f.endswith(".log")
-    ]
-    log_files.sort()
-
-    for log_fname in log_files:
-        log_path = os.path.join(log_folder, log_fname)
+
+    # scandir serves name checks from the readdir batch with no extra stat
+    with os.scandir(log_folder) as it:
+        log_paths = sorted(
+            entry.path for entry in it
+            if entry.name.startswith("log_") and entry.name.endswith(".log")
+        )
+
+    for log_path in log_paths:
         try:
-            with open(log_path, 'r', encoding='utf-8') as file:
+            # 1 MB buffer: far fewer read syscalls than the default 8 KB
+            # when iterating long logs
+            with open(log_path, 'rb', buffering=1 << 20) as file:
                 for line in file:
-                    if "setting active recording" in line.lower():
-                        try:
-                            # Typically: [YYYY-MM-DDTHH:MM:SS.ssssss]
-                            bracket_text = line.split(']')[0]
-                            timestamp_str = bracket_text[1:]  # remove leading '['
-                            log_time = datetime.strptime(timestamp_str, "%Y-%m-%dT%H:%M:%S.%f")
-                            all_timestamps.append((log_time, line.strip()))
-                        except (ValueError, IndexError):
-                            continue
+                    # Cheap substring shortcut before paying for the regex;
+                    # dropping the leading char tolerates "Setting"/"setting"
+                    # without allocating a lowercased copy of every line
+                    if b"etting active recording" not in line:
+                        continue
+                    match = _REC_RE.match(line)
+                    if not match:
+                        continue
+                    # Typically: [YYYY-MM-DDTHH:MM:SS.ssssss]
+                    # Fixed-position integer slicing beats strptime's
+                    # format-dispatch machinery on every matched line
+                    ts = match.group(1)
+                    try:
+                        log_time = datetime(
+                            int(ts[0:4]), int(ts[5:7]), int(ts[8:10]),
+                            int(ts[11:13]), int(ts[14:16]), int(ts[17:19]),
+                            int(ts[20:26].ljust(6, b'0'))
+                        )
+                    except (ValueError, IndexError):
+                        continue
+                    all_timestamps.append((log_time, line.decode('utf-8', 'replace').strip()))
         except FileNotFoundError:
             pass
-    return all_timestamps
+    # Tuple so the cached value cannot be mutated by callers
+    return tuple(all_timestamps)
+
+@functools.lru_cache(maxsize=None)
+def _sorted_log_timestamps(log_folder):
+    """
+    Chronologically sorted timestamps for log_folder plus their epoch values,
+    so closest-timestamp queries can bisect instead of scanning.
+    """
+    times = sorted(t for t, _ in gather_log_timestamps(log_folder))
+    # float64 epoch array: distance computations become one vectorized
+    # subtract instead of a timedelta allocation per element
+    epochs = np.fromiter((t.timestamp() for t in times), dtype=np.float64, count=len(times))
+    return times, epochs
 
-def find_recording_start_timestamp(log_folder, approx_time):
+def find_recording_start_timestamp(log_times, approx_time):
     """
-    From all 'Setting active recording' timestamps in log_folder, 
-    return the one closest to approx_time. If none found, return None.
+    From preloaded 'Setting active recording' timestamps (as returned by
+    _sorted_log_timestamps), return the one closest to approx_time.
+    If none found, return None. Pure lookup — no file I/O.
     """
-    all_timestamps = gather_log_timestamps(log_folder)
-    if not all_timestamps:
+    times, epochs = log_times
+    if not times:
         return None
 
-    # Sort by how close they are to approx_time
-    all_timestamps.sort(key=lambda x: abs((x[0] - approx_time).total_seconds()))
-    
-    return all_timestamps[0][0]  # The closest timestamp
+    # Binary search for the insertion point; the closest timestamp is one of
+    # its two neighbours, picked by vectorized epoch distance
+    approx_epoch = approx_time.timestamp()
+    i = bisect.bisect_left(epochs, approx_epoch)
+    lo = max(i - 1, 0)
+    return times[lo + int(np.abs(epochs[lo:i + 1] - approx_epoch).argmin())]
 
-def process_recording_folder(session_dir, recording_folder, session_date, log_folder):
+def process_recording_folder(session_dir, recording_folder, session_date, log_times):
     """
     Attempts to parse a folder name of the form:
       recording_14_47_20(.123)?(_gmt+X)?...
@@ -89,44 +139,19 @@ def process_recording_folder(session_dir, recording_folder, session_date, log_fo
         print(f"  Skipping calibration folder '{folder_name}'.")
         return
 
-    # Example patterns we might see:
+    # Example patterns we might see (all handled by _FOLDER_RE in one pass):
     #   recording_14_47_20
     #   recording_14_47_20_gmt+1
     #   recording_14_47_20.123
     #   recording_14_47_20.123_gmt+1
     #   recording_14_47_60.999_gmt+2 (invalid seconds --> skip)
-    
-    parts = folder_name.split('_')
-    # Minimum: ["recording", HH, MM, SSorSS.xxx...]
-    if len(parts) < 4:
-        print(f"  Skipping folder '{folder_name}' – cannot parse HH,MM,SS.")
-        return
 
-    try:
-        hh = int(parts[1])  # e.g. "14"
-        mm = int(parts[2])  # e.g. "47"
-    except ValueError:
-        print(f"  Skipping folder '{folder_name}' – hour/minute not numeric.")
+    match = _FOLDER_RE.match(folder_name)
+    if not match:
+        print(f"  Skipping folder '{folder_name}' – cannot parse HH,MM,SS.")
         return
 
-    # Handle the "seconds" part (which could be "20", "20.123", "20.123_gmt+1", etc.)
-    ss_part = parts[3]
-
-    # 1) If there's a dot, split on it and keep only what's before the dot
-    #    e.g. "20.123" -> "20", or "20.123_gmt+1" -> "20"
-    if '.' in ss_part:
-        ss_part = ss_part.split('.')[0]
-
-    # 2) If there's an underscore left, e.g. "20_gmt+1", split on '_' and keep first chunk
-    if '_' in ss_part:
-        ss_part = ss_part.split('_')[0]
-
-    # Now ss_part should be purely integer-like (e.g., "20")
-    try:
-        ss = int(ss_part)
-    except ValueError:
-        print(f"  Skipping folder '{folder_name}' – could not parse seconds from '{ss_part}'.")
-        return
+    hh, mm, ss = map(int, match.groups())
 
     # Check the valid range for seconds
     if not (0 <= ss <= 59):
@@ -147,18 +172,21 @@ def process_recording_folder(session_dir, recording_folder, session_date, log_fo
         print(f"  Skipping folder '{folder_name}' – invalid date/time: {e}")
         return
     
-    # Find best match in logs
-    actual_start_time = find_recording_start_timestamp(log_folder, approx_time)
+    # Find best match in the preloaded log timestamps
+    actual_start_time = find_recording_start_timestamp(log_times, approx_time)
     if not actual_start_time:
         print(f"  No suitable timestamp found for '{folder_name}' in logs.")
         return
     
-    # Construct a new folder name with ms
-    # e.g. "recording_14_47_20.123"
-    new_time_str = actual_start_time.strftime("%H_%M_%S.%f")[:-3]  # remove last 3 digits of microseconds
-    new_folder_name = f"recording_{new_time_str}"
-    old_folder_path = os.path.join(session_dir, folder_name)
-    new_folder_path = os.path.join(session_dir, new_folder_name)
+    # Construct a new folder name with ms, e.g. "recording_14_47_20.123"
+    # (direct field formatting skips strftime's locale-aware machinery)
+    t = actual_start_time
+    new_folder_name = (f"recording_{t.hour:02d}_{t.minute:02d}_{t.second:02d}"
+                       f".{t.microsecond // 1000:03d}")
+    # recording_folder already carries the full path (scandir entry.path);
+    # plain concatenation skips os.path.join's per-call dispatch
+    old_folder_path = recording_folder
+    new_folder_path = session_dir + os.sep + new_folder_name
 
     try:
         os.rename(old_folder_path, new_folder_path)
@@ -166,74 +194,95 @@ def process_recording_folder(session_dir, recording_folder, session_date, log_fo
     except Exception as e:
         print(f"  Could not rename '{folder_name}' -> '{new_folder_name}' due to: {e}")
 
-def process_session_folder(session_folder, log_folder):
+def process_session_folder(session_folder, log_times):
     """
     session_folder might look like "session_YYYY-MM-DD_HH_MM_SS".
     Parse that, then process any subfolder starting with "recording_".
+    log_times is the participant's preloaded log data (see
+    _sorted_log_timestamps), shared across all sessions.
     """
     folder_name = os.path.basename(session_folder)
     if not folder_name.startswith("session_"):
         return
 
     # Example: "session_2024-11-18_14_15_03"
+    # Fixed-width layout, so integer slicing replaces the much slower strptime
     date_str = folder_name[len("session_"):]
     try:
-        session_dt = datetime.strptime(date_str, "%Y-%m-%d_%H_%M_%S")
-    except ValueError:
+        session_dt = datetime(
+            int(date_str[0:4]), int(date_str[5:7]), int(date_str[8:10]),
+            int(date_str[11:13]), int(date_str[14:16]), int(date_str[17:19])
+        )
+    except (ValueError, IndexError):
         print(f"Skipping '{folder_name}' – not matching 'session_YYYY-MM-DD_HH_MM_SS'.")
         return
 
-    for item in os.listdir(session_folder):
-        sub_path = os.path.join(session_folder, item)
-        if os.path.isdir(sub_path) and item.startswith("recording_"):
-            process_recording_folder(session_folder, sub_path, session_dt, log_folder)
+    with os.scandir(session_folder) as it:
+        for entry in it:
+            if entry.name.startswith("recording_") and entry.is_dir(follow_symlinks=False):
+                process_recording_folder(session_folder, entry.path, session_dt, log_times)
 
-def process_all_participants():
+def _process_participant(i, participants_root):
     """
-    Loops through P(1) to P(8), checks:
+    Processes one participant's recording sessions. Checks:
       - Camera Data Timestamped\logs_info_and_settings\logs   for .log files
       - Camera Data Timestamped\recording_sessions\session_...
          -> recording_... folders
     Skips calibration folders, handles .ms suffix, gmt+X, etc.
     """
+    participant_str = f"P({i})"
+    participant_dir = os.path.join(participants_root, participant_str)
+    if not os.path.isdir(participant_dir):
+        print(f"Participant folder '{participant_str}' not found. Skipping.")
+        return
+
+    camera_data_dir = os.path.join(participant_dir, "Camera Data Timestamped")
+    if not os.path.isdir(camera_data_dir):
+        camera_data_dir = os.path.join(participant_dir, "Camera Data")  # fallback
+        if not os.path.isdir(camera_data_dir):
+            print(f"No camera data folder for {participant_str}. Skipping.")
+            return
+
+    # logs folder
+    logs_dir = os.path.join(camera_data_dir, "logs_info_and_settings", "logs")
+    if not os.path.isdir(logs_dir):
+        print(f"No 'logs' folder found for {participant_str}. Skipping.")
+        return
+
+    # sessions folder
+    sessions_dir = os.path.join(camera_data_dir, "recording_sessions")
+    if not os.path.isdir(sessions_dir):
+        print(f"No 'recording_sessions' folder for {participant_str}. Skipping.")
+        return
+
+    print(f"Processing {participant_str} in:\n  {sessions_dir}\n")
+
+    # Parse the participant's log corpus exactly once and share the
+    # result across all sessions and recordings
+    log_times = _sorted_log_timestamps(logs_dir)
+
+    with os.scandir(sessions_dir) as it:
+        for entry in it:
+            if entry.name.startswith("session_") and entry.is_dir(follow_symlinks=False):
+                process_session_folder(entry.path, log_times)
+
+    print()
+
+def process_all_participants():
+    """
+    Runs _process_participant for P(1) to P(8) on a thread pool. Each
+    participant reads a disjoint log directory and renames disjoint folders,
+    and the work is dominated by file I/O (which releases the GIL), so
+    threads overlap the latency across participants.
+    """
     participants_root = (
         r"C:\Users\schmi\Documents\Studium\TUM\5. Semester\Masterthesis\Experimental Data"
     )
 
-    for i in range(8, 9):
-        participant_str = f"P({i})"
-        participant_dir = os.path.join(participants_root, participant_str)
-        if not os.path.isdir(participant_dir):
-            print(f"Participant folder '{participant_str}' not found. Skipping.")
-            continue
-
-        camera_data_dir = os.path.join(participant_dir, "Camera Data Timestamped")
-        if not os.path.isdir(camera_data_dir):
-            camera_data_dir = os.path.join(participant_dir, "Camera Data")  # fallback
-            if not os.path.isdir(camera_data_dir):
-                print(f"No camera data folder for {participant_str}. Skipping.")
-                continue
-
-        # logs folder
-        logs_dir = os.path.join(camera_data_dir, "logs_info_and_settings", "logs")
-        if not os.path.isdir(logs_dir):
-            print(f"No 'logs' folder found for {participant_str}. Skipping.")
-            continue
-
-        # sessions folder
-        sessions_dir = os.path.join(camera_data_dir, "recording_sessions")
-        if not os.path.isdir(sessions_dir):
-            print(f"No 'recording_sessions' folder for {participant_str}. Skipping.")
-            continue
-
-        print(f"Processing {participant_str} in:\n  {sessions_dir}\n")
-
-        for session_folder_name in os.listdir(sessions_dir):
-            session_folder_path = os.path.join(sessions_dir, session_folder_name)
-            if os.path.isdir(session_folder_path) and session_folder_name.startswith("session_"):
-                process_session_folder(session_folder_path, logs_dir)
-
-        print()
+    with ThreadPoolExecutor(max_workers=min(8, os.cpu_count())) as executor:
+        # list() drains the iterator so worker exceptions surface here
+        list(executor.map(lambda i: _process_participant(i, participants_root),
+                          range(1, 9)))
 
 if __name__ == "__main__":
     process_all_participants()
